@@ -0,0 +1,149 @@
+"""
+=======================================================
+_rtc_serial.py - Shared Serial Helpers for the DS1307 Tools
+=======================================================
+
+Copyright (c) 2025 Alejandro Meza
+Website: http://mcuelectronica.com.ar
+Contact: mcu.electronica@gmail.com
+
+This script is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation; either version 2.1
+of the License, or (at your option) any later version.
+
+This script is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this script; if not, visit <https://www.gnu.org/licenses/>.
+
+Description:
+------------
+Internal module used by the scripts in `tools/`. It provides the
+serial helpers needed to talk to the DS1307 firmware, so every tool
+shares the same behavior.
+
+"""
+
+import os
+import queue
+import serial
+from serial.threaded import LineReader
+
+def enable_low_latency(ser):
+    """
+    Reduces USB-serial latency on Linux so short command replies are delivered immediately.
+
+    Sets the ASYNC_LOW_LATENCY flag on the port and lowers the FTDI latency timer to 1 ms.
+    Both steps are best-effort: on Windows, macOS or adapters without these controls the
+    port is left unchanged.
+
+    Args:
+        ser (serial.Serial): Opened serial connection to the RTC.
+    """
+    try:
+        ser.set_low_latency_mode(True)  # TIOCGSERIAL/TIOCSSERIAL with ASYNC_LOW_LATENCY
+    except (AttributeError, ValueError, OSError):
+        pass
+
+    tty = os.path.basename(os.path.realpath(ser.port))
+    try:
+        with open(f"/sys/bus/usb-serial/devices/{tty}/latency_timer", "w") as latency_timer:
+            latency_timer.write("1")
+    except OSError:
+        pass
+
+def open_port(port_name, timeout=3):
+    """
+    Opens the serial port used by the RTC firmware and configures it for low latency.
+
+    Args:
+        port_name (str): Name of the serial port (e.g., "COM5" or "/dev/ttyUSB0").
+        timeout (float, optional): Seconds each blocking read of the port may wait. Replies are
+            read by the ReaderThread, so this only bounds how long it takes to notice the
+            port closing; use read_reply() to wait for a reply. Defaults to 3.
+
+    Returns:
+        serial.Serial: The opened serial connection.
+    """
+    ser = serial.Serial(port_name, baudrate=9600, timeout=timeout)
+    enable_low_latency(ser)
+    return ser
+
+class RtcLineReader(LineReader):
+    """
+    Line protocol for serial.threaded.ReaderThread.
+
+    The reader thread drains the port in the background and queues every
+    complete line, so commands can be written while earlier replies or
+    unsolicited messages from the firmware are still arriving.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.received = queue.Queue()
+
+    def handle_line(self, line):
+        self.received.put(line.strip())
+
+def write_command(rtc, *commands):
+    """
+    Writes one or more newline-terminated commands to the RTC in a single transaction.
+    Lines still queued from earlier exchanges are discarded first, so the replies read
+    afterwards belong to these commands.
+
+    Args:
+        rtc (RtcLineReader): Protocol attached to the RTC serial connection.
+        *commands (bytes): Commands to send, each ending in b"\n" (e.g., b"GET_TIME\n").
+    """
+    discard_pending(rtc)
+    rtc.transport.write(b"".join(commands))
+
+def read_reply(rtc, timeout=3):
+    """
+    Waits for the next reply line from the RTC, returning as soon as it arrives.
+
+    Args:
+        rtc (RtcLineReader): Protocol attached to the RTC serial connection.
+        timeout (float, optional): Seconds to wait for the line. Defaults to 3.
+
+    Returns:
+        str: The reply without surrounding whitespace, or an empty string on timeout.
+    """
+    try:
+        return rtc.received.get(timeout=timeout)
+    except queue.Empty:
+        return ""
+
+def discard_pending(rtc, settle=0):
+    """
+    Drops reply lines that are queued or still arriving, such as a boot banner or a late reply.
+
+    Args:
+        rtc (RtcLineReader): Protocol attached to the RTC serial connection.
+        settle (float, optional): Seconds the port must stay quiet before returning.
+            Defaults to 0, which only empties what is already queued.
+    """
+    while True:
+        try:
+            rtc.received.get(timeout=settle)
+        except queue.Empty:
+            return
+
+def txrx(rtc, command, timeout=3):
+    """
+    Sends a single command to the RTC and returns its reply.
+
+    Args:
+        rtc (RtcLineReader): Protocol attached to the RTC serial connection.
+        command (bytes): Command to send, ending in b"\n".
+        timeout (float, optional): Seconds to wait for the reply. Defaults to 3.
+
+    Returns:
+        str: The reply line, or an empty string on timeout.
+    """
+    write_command(rtc, command)
+    return read_reply(rtc, timeout)
@@ -40,18 +40,16 @@ The output will display:
 
 """
 
-from datetime import datetime
-from tzlocal import get_localzone
-import pytz
-
-# Automatically detect the system's local timezone
-local_tz = get_localzone()
+from datetime import datetime, timezone
 
 # Get current UTC time
-now_utc = datetime.now(pytz.utc)
+now_utc = datetime.now(timezone.utc)
+
+# Get local time using the operating system's timezone
+now_local = now_utc.astimezone()
 
-# Get local time with the detected timezone
-now_local = datetime.now(pytz.timezone(str(local_tz)))
+# Timezone detected from the operating system
+local_tz = now_local.tzinfo
 
 # Display results
 print(f"🕒 Detected Timezone      : {local_tz}")
@@ -31,7 +31,7 @@ local time in the RTC and retrieving it correctly.
 Usage:
 ------
 1. Install dependencies:
-   pip install pyserial pytz tzlocal
+   pip install pyserial
 
 2. Run the script specifying the COM port and time type:
    - Store UTC time:    python rtc_sync.py COM5 utc
@@ -40,17 +40,46 @@ Usage:
 3. The RTC will be updated with the selected time, and the stored 
    time will be retrieved and displayed.
 
+4. For repeated synchronizations, add --daemon to keep the port open
+   and avoid the board reset on every run. A sync is performed for each
+   line read from stdin ("utc", "local" or empty for the default):
+   - python rtc_sync.py /dev/ttyUSB0 utc --daemon
+
 """
 
 import argparse
 import serial
+import sys
 import time
-from datetime import datetime, timezone
-import pytz
-from tzlocal import get_localzone
+from datetime import datetime
+from serial.threaded import ReaderThread
+from _rtc_serial import RtcLineReader, open_port, write_command, read_reply, discard_pending, txrx
+
+# Cached local UTC offset as (expiry, offset_seconds), refreshed by get_utc_offset()
+_offset_cache = (0.0, 0)
+
+def get_utc_offset(now):
+    """
+    Returns the local UTC offset in seconds, cached until the next minute boundary.
+
+    Timezone and DST transitions always fall on a whole minute, so the cached
+    value is exact while it is valid and long-running sessions (see --daemon)
+    avoid a localtime() call per synchronization.
+
+    Args:
+        now (float): Current UNIX time as returned by time.time().
+
+    Returns:
+        int: Offset from UTC in seconds, DST included.
+    """
+    global _offset_cache
 
-# Automatically detect the system's local timezone
-TZ_LOCAL = get_localzone()
+    expiry, offset_seconds = _offset_cache
+    if now >= expiry:
+        offset_seconds = time.localtime(now).tm_gmtoff
+        _offset_cache = (now - now % 60 + 60, offset_seconds)
+
+    return offset_seconds
 
 def get_unix_time(time_type):
     """
@@ -62,108 +91,164 @@ def get_unix_time(time_type):
     Returns:
         int: The UNIX timestamp to be sent to the RTC.
     """
-    now_local = datetime.now(pytz.timezone(str(TZ_LOCAL)))  # Get local time with correct timezone
-    now_utc = datetime.now(pytz.utc)  # Get current UTC time
+    now = time.time()  # Single clock read shared by both branches
 
     if time_type == 'utc':
-        unix_timestamp = int(now_utc.timestamp())  # Standard UTC UNIX timestamp
+        unix_timestamp = int(now)  # Standard UTC UNIX timestamp
         print(f"🕒 UNIX Timestamp UTC to send to RTC: {unix_timestamp}")
 
     else:  # If "local" is selected
-        offset_seconds = now_local.utcoffset().total_seconds()  # Get the UTC offset in seconds
-        unix_timestamp = int(now_utc.timestamp()) + int(offset_seconds)  # Adjust to store real local time
+        unix_timestamp = int(now) + get_utc_offset(now)  # Adjust to store real local time
         print(f"🕒 UNIX Timestamp Local to send to RTC: {unix_timestamp}")
 
     return unix_timestamp
 
-def detect_rtc(ser, retries=3):
+def detect_rtc(rtc, retries=3, timeout=0.3):
     """
     Checks if the RTC is responding correctly before attempting synchronization.
 
     Args:
-        ser (serial.Serial): Opened serial connection to the RTC.
+        rtc (RtcLineReader): Protocol attached to the RTC serial connection.
         retries (int, optional): Number of attempts before giving up. Defaults to 3.
+        timeout (float, optional): Seconds to wait for each reply. Defaults to 0.3, since the
+            firmware answers CHECK_RTC within milliseconds.
 
     Returns:
         bool: True if the RTC responds correctly, False otherwise.
     """
     for attempt in range(retries):
-        ser.write(b"CHECK_RTC\n")
-        time.sleep(1.5)
+        response = txrx(rtc, b"CHECK_RTC\n", timeout)  # Returns as soon as the reply line arrives
 
-        if ser.in_waiting > 0:
-            response = ser.readline().decode('utf-8').strip()
+        if response:
             print(f"📡 Attempt {attempt + 1}: Response received -> {response}")
             if response == "OK":
+                # Replies to earlier attempts (or a boot banner) may still be arriving; drop them
+                # so the next command reads its own reply, as the old settle-and-flush did
+                discard_pending(rtc, settle=0.2)
                 return True
         else:
             print(f"⏳ No response received on attempt {attempt + 1}. Retrying...")
 
     return False
 
-def get_human_readable_time(ser, time_type):
+def show_rtc_time(response, time_type):
     """
-    Retrieves and displays the date and time stored in the RTC.
+    Displays a GET_TIME reply already read from the RTC.
 
     Args:
-        ser (serial.Serial): Opened serial connection to the RTC.
+        response (str): Line returned by the RTC for GET_TIME, or an empty string if none arrived.
         time_type (str): "utc" if the RTC stores UTC time, "local" if it stores local time.
     """
-    ser.write(b"GET_TIME\n")
-    time.sleep(2)
-
-    if ser.in_waiting > 0:
-        response = ser.readline().decode('utf-8').strip()
+    if response:
         print(f"📅 Time stored in RTC: {response}")
 
         try:
-            rtc_datetime = datetime.strptime(response, "%Y/%m/%d %H:%M:%S")
+            # The firmware prints "Y/M/D H:MM:SS" without zero-padding the year, month, day or hour,
+            # so split the fields directly instead of running the strptime/strftime round-trip
+            date_part, time_part = response.split(" ")
+            date_fields = date_part.split("/")
+            time_fields = time_part.split(":")
+            if not all(field.isdigit() for field in date_fields + time_fields):
+                raise ValueError(response)
+
+            year, month, day = (int(field) for field in date_fields)
+            hour, minute, second = (int(field) for field in time_fields)
+            datetime(year, month, day, hour, minute, second)  # Range check only; raises ValueError
+            rtc_time = f"{year:04d}/{month:02d}/{day:02d} {hour:02d}:{minute:02d}:{second:02d}"
 
             if time_type == "utc":
-                print(f"🕒 RTC Time: {rtc_datetime.strftime('%Y/%m/%d %H:%M:%S')} UTC")
+                print(f"🕒 RTC Time: {rtc_time} UTC")
             else:
-                print(f"🕒 RTC Time: {rtc_datetime.strftime('%Y/%m/%d %H:%M:%S')} Local")
+                print(f"🕒 RTC Time: {rtc_time} Local")
 
         except ValueError:
             print("⚠️  Unrecognized time format in GET_TIME.")
     else:
         print("⚠️  No response received from RTC for GET_TIME.")
 
-def send_command(port_name, time_type):
+def sync_rtc(rtc, time_type):
     """
     Sends the SET_UNIX command with the correct timestamp to the RTC and then retrieves GET_TIME.
+    Both commands are written in a single transaction and their replies are read back-to-back.
+
+    Args:
+        rtc (RtcLineReader): Protocol attached to the RTC serial connection.
+        time_type (str): "utc" to store UTC time, "local" to store local time.
+
+    Returns:
+        bool: True if the RTC echoed the timestamp and returned its stored time, False otherwise.
+    """
+    unix_time = get_unix_time(time_type)
+    command = b"SET_UNIX %d\n" % unix_time  # Formatted straight to bytes, no str round-trip
+
+    write_command(rtc, command, b"GET_TIME\n")  # Pipeline SET_UNIX and GET_TIME
+    print(f"📤 Sent: {command.decode('ascii').strip()}")
+
+    response = read_reply(rtc)  # SET_UNIX echo
+    stored = read_reply(rtc)    # GET_TIME reply
+
+    if response == str(unix_time):
+        print("✅ RTC successfully updated. Sent and received values match.")
+        show_rtc_time(stored, time_type)  # Display stored RTC time
+        return bool(stored)
+
+    print(f"⚠️  Unexpected response from device: {response} (expected: {unix_time})")
+    return False
+
+def run_daemon(rtc, time_type):
+    """
+    Keeps the serial port open and synchronizes the RTC once per line read from stdin.
+
+    Each line may contain "utc" or "local" to choose the time type for that
+    synchronization; an empty line uses the default. The loop ends at EOF.
+
+    Args:
+        rtc (RtcLineReader): Protocol attached to the RTC serial connection.
+        time_type (str): Default time type, "utc" or "local".
+    """
+    print("🔁 Daemon mode: send 'utc', 'local' or an empty line to synchronize, EOF to exit.", flush=True)
+
+    for line in sys.stdin:
+        requested = line.strip().lower() or time_type
+
+        if requested in ("utc", "local"):
+            if not sync_rtc(rtc, requested):
+                # A mismatch or timeout can leave replies in flight; wait for them so they
+                # are not read as the echo of the next synchronization
+                discard_pending(rtc, settle=0.5)
+        else:
+            print(f"⚠️  Unknown time type: {requested} (expected: utc or local)")
+
+        sys.stdout.flush()
+
+def send_command(port_name, time_type, daemon=False):
+    """
+    Opens the serial port, checks that the RTC responds and synchronizes it.
 
     Args:
         port_name (str): Name of the serial port (e.g., "COM5" or "/dev/ttyUSB0").
         time_type (str): "utc" to store UTC time, "local" to store local time.
+        daemon (bool, optional): Keep the port open and synchronize on every stdin line
+            instead of once. Defaults to False.
     """
     try:
-        with serial.Serial(port_name, baudrate=9600, timeout=3) as ser:
+        with open_port(port_name) as ser:
             print(f"🔌 Connected to port {port_name}, waiting for initialization...")
-            time.sleep(2)
             ser.reset_input_buffer()
-            time.sleep(1)
 
-            if not detect_rtc(ser):
-                print("⚠️  No RTC detected on the selected port.")
-                return
+            # A background thread reads and queues reply lines while commands are written
+            with ReaderThread(ser, RtcLineReader) as rtc:
+                # Poll instead of sleeping: extra retries cover the bootloader delay if opening the port reset the board
+                if not detect_rtc(rtc, retries=10):
+                    print("⚠️  No RTC detected on the selected port.")
+                    return
 
-            print("✅ RTC device successfully detected.")
+                print("✅ RTC device successfully detected.")
 
-            unix_time = get_unix_time(time_type)
-            command = f"SET_UNIX {unix_time}\n"
-
-            ser.write(command.encode('utf-8'))
-            print(f"📤 Sent: {command.strip()}")
-
-            time.sleep(2)
-            response = ser.readline().decode('utf-8').strip()
-
-            if response == str(unix_time):
-                print("✅ RTC successfully updated. Sent and received values match.")
-                get_human_readable_time(ser, time_type)  # Retrieve stored RTC time
-            else:
-                print(f"⚠️  Unexpected response from device: {response} (expected: {unix_time})")
+                if daemon:
+                    run_daemon(rtc, time_type)
+                else:
+                    sync_rtc(rtc, time_type)
 
     except serial.SerialException as e:
         print(f"❌ Error opening port {port_name}: {e}")
@@ -178,9 +263,10 @@ def main():
     parser = argparse.ArgumentParser(description="Synchronizes UNIX time with a DS1307 RTC via the serial port.")
     parser.add_argument("port", type=str, help="COM port name (e.g., COM3 or /dev/ttyUSB0).")
     parser.add_argument("time_type", type=str, choices=["local", "utc"], help="Time type to store in RTC: local or UTC.")
+    parser.add_argument("--daemon", action="store_true", help="Keep the port open and synchronize once per line read from stdin.")
 
     args = parser.parse_args()
-    send_command(args.port, args.time_type)
+    send_command(args.port, args.time_type, args.daemon)
 
 if __name__ == "__main__":
     main()